@@ -205,9 +205,10 @@ def load_questions(
     qa_map: Dict[str, List[str]] = {}
     qid_map: Dict[str, str] = {}
     question_list: List[str] = []
+    # q_col/a_col a fejlécből jön, így minden sorban megvan a kulcs (rövid sorban None)
     for r in rows:
-        q = (r.get(q_col, "") or "").strip()
-        a_raw = r.get(a_col, "") or ""
+        q = (r[q_col] or "").strip()
+        a_raw = r[a_col] or ""
         if not q:
             continue
         qid = extract_qid(q)
@@ -1,28 +1,116 @@
 from __future__ import annotations
 import csv
+import os
+import pickle
 import re
+import tempfile
+from collections import Counter, defaultdict
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Set, TextIO, Tuple
 import math
 import random
 
 
 SelectionResult = Tuple[List[str], Dict[str, List[str]], Dict[str, int]]
 
+# A sidecar cache formátumverziója; a feldolgozás változásakor növelendő.
+_CACHE_FORMAT = 1
 
-def _detect_csv_dialect(path: Path) -> Optional[csv.Dialect]:
-    """CSV dialektus autodetekció; hiba esetén None."""
-    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+
+class _FastSniffer(csv.Sniffer):
+    """
+    csv.Sniffer, amelynek elválasztó-keresése csak a sorban ténylegesen
+    előforduló karaktereket számolja (a CPython 3.15-ös _guess_delimiter backportja).
+    """
+
+    def _guess_delimiter(self, data, delimiters):
+        data = list(filter(None, data.split("\n")))
+
+        # gyakorisági táblák: {karakter: {soronkénti_darab: sorok_száma}}
+        chunk_length = min(10, len(data))
+        iteration = 0
+        num_lines = 0
+        char_frequency: Dict[str, Counter] = defaultdict(Counter)
+        modes = {}
+        delims = {}
+        start, end = 0, chunk_length
+        while start < len(data):
+            iteration += 1
+            for line in data[start:end]:
+                num_lines += 1
+                for char, count in Counter(line).items():
+                    if char.isascii():
+                        char_frequency[char][count] += 1
+
+            for char, counts in char_frequency.items():
+                items = list(counts.items())
+                # azok a sorok, ahol a karakter egyszer sem fordult elő
+                missed_lines = num_lines - sum(counts.values())
+                if missed_lines:
+                    items.append((0, missed_lines))
+                if len(items) == 1 and items[0][0] == 0:
+                    continue
+                if len(items) > 1:
+                    modes[char] = max(items, key=lambda x: x[1])
+                    items.remove(modes[char])
+                    modes[char] = (modes[char][0], modes[char][1] - sum(item[1] for item in items))
+                else:
+                    modes[char] = items[0]
+
+            mode_list = modes.items()
+            total = float(min(chunk_length * iteration, len(data)))
+            consistency = 1.0
+            threshold = 0.9
+            while len(delims) == 0 and consistency >= threshold:
+                for k, v in mode_list:
+                    if v[0] > 0 and v[1] > 0:
+                        if (v[1] / total) >= consistency and (delimiters is None or k in delimiters):
+                            delims[k] = v
+                consistency -= 0.01
+
+            if len(delims) == 1:
+                delim = list(delims.keys())[0]
+                skipinitialspace = data[0].count(delim) == data[0].count("%c " % delim)
+                return (delim, skipinitialspace)
+
+            start = end
+            end += chunk_length
+
+        if not delims:
+            return ("", 0)
+
+        if len(delims) > 1:
+            for d in self.preferred:
+                if d in delims.keys():
+                    skipinitialspace = data[0].count(d) == data[0].count("%c " % d)
+                    return (d, skipinitialspace)
+
+        items = [(v, k) for (k, v) in delims.items()]
+        items.sort()
+        delim = items[-1][1]
+
+        skipinitialspace = data[0].count(delim) == data[0].count("%c " % delim)
+        return (delim, skipinitialspace)
+
+
+def _detect_csv_dialect(f: TextIO) -> Optional[csv.Dialect]:
+    """CSV dialektus autodetekció a megnyitott fájl elejéből; hiba esetén None. A fájlt visszatekeri."""
+    try:
         sample = f.read(4096)
-        try:
-            return csv.Sniffer().sniff(sample, delimiters=[",", ";", "\t"])
-        except csv.Error:
-            return None
+        return _FastSniffer().sniff(sample, delimiters=[",", ";", "\t"])
+    except csv.Error:
+        return None
+    finally:
+        f.seek(0)
 
 
-def _find_column(row: dict, *candidates: str) -> Optional[str]:
-    """Megkeresi a megadott oszlopnevek egyikét a row kulcsai között (case-insensitive)."""
-    lower_map = {k.strip().lower(): k for k in row.keys() if isinstance(k, str)}
+def _find_column(header: List[str], *candidates: str) -> Optional[int]:
+    """
+    Megkeresi a megadott oszlopnevek egyikének indexét a fejlécben (case-insensitive).
+    Ismétlődő fejlécnél – a DictReaderhez hasonlóan – az utolsó előfordulás nyer.
+    """
+    lower_map = {h.strip().lower(): i for i, h in enumerate(header)}
     for cand in candidates:
         if cand in lower_map:
             return lower_map[cand]
@@ -31,28 +119,31 @@ def _find_column(row: dict, *candidates: str) -> Optional[str]:
 
 # --- Válaszok bontása: ';' és ' - '; sor eleji '-' -> bulletblokk; '/' nem bont ---
 
+_HYPHEN_SPLIT_RE = re.compile(r"\s-\s+")
+
+
+def _bullet_text(line: str) -> Optional[str]:
+    """Ha a sor '-' + whitespace kezdetű bullet, a bullet szövegét adja vissza, különben None."""
+    s = line.lstrip()
+    if s[:1] == "-" and s[1:2].isspace():
+        return s[1:].lstrip()
+    return None
+
 
 def _split_line_bullets_multiline(text: str) -> List[str]:
-    """Sor eleji '- ' bulletok szerinti több soros bontás."""
-    if not text.strip():
-        return []
-    if not re.search(r"(?m)^\s*\-\s+", text):
-        return []
-    lines = text.splitlines()
+    """Sor eleji '- ' bulletok szerinti több soros bontás (bullet nélkül üres lista)."""
     answers: List[str] = []
     current: List[str] = []
     in_bullet = False
-    for ln in lines:
-        m = re.match(r"^\s*\-\s+(.*)", ln)
-        if m:
+    for ln in text.splitlines():
+        body = _bullet_text(ln)
+        if body is not None:
             if current:
                 answers.append("\n".join(current).rstrip())
-                current = []
+            current = [body]
             in_bullet = True
-            current.append(m.group(1))
-        else:
-            if in_bullet:
-                current.append(ln.rstrip())
+        elif in_bullet:
+            current.append(ln.rstrip())
     if current:
         answers.append("\n".join(current).rstrip())
     return [a for a in answers if a.strip()]
@@ -63,8 +154,8 @@ def _split_inline_hyphen_semicolon(text: str) -> List[str]:
     s = (text or "").strip()
     if not s:
         return []
-    if re.search(r"\s-\s+", s):
-        parts = re.split(r"\s-\s+", s)
+    if "-" in s and _HYPHEN_SPLIT_RE.search(s):
+        parts = _HYPHEN_SPLIT_RE.split(s)
         return [p.strip(" ;") for p in parts if p.strip(" ;")]
     if ";" in s:
         parts = s.split(";")
@@ -82,14 +173,81 @@ def _answers_from_cell(cell: Optional[str]) -> List[str]:
     """
     if cell is None:
         return []
-    txt = cell.replace("\r\n", "\n").replace("\r", "\n").strip()
-    bullets = _split_line_bullets_multiline(txt)
-    if bullets:
-        return bullets
-    inline = _split_inline_hyphen_semicolon(txt)
-    if inline:
-        return inline
-    return [txt] if txt else []
+    # a normalizálás csak '\r' esetén kell (magányos '\r' is sortörés, ezért nem elég törölni)
+    txt = cell.replace("\r\n", "\n").replace("\r", "\n") if "\r" in cell else cell
+    txt = txt.strip()
+    if not txt:
+        return []
+    # '-' nélkül sem bullet, sem ' - ' bontás nem lehet: egy C-szintű keresés kiváltja a soronkénti próbát
+    if "-" in txt:
+        bullets = _split_line_bullets_multiline(txt)
+        if bullets:
+            return bullets
+    return _split_inline_hyphen_semicolon(txt) or [txt]
+
+
+def _add_unique(target: List[str], seen: Set[str], answers: Iterable[str]) -> None:
+    """A még nem látott (kisbetűsítve egyedi) válaszokat fűzi a listához, strip-elve."""
+    for ans in answers:
+        if not ans:
+            continue
+        a = ans.strip()
+        key = a.lower()
+        if key and key not in seen:
+            seen.add(key)
+            target.append(a)
+
+
+def _merge_unique(
+    qa: Dict[str, List[str]], seen_keys: Dict[str, Set[str]], question: str, answers: Iterable[str]
+) -> None:
+    """
+    Duplikált kérdés válaszainak egyesítése.
+    Az első duplikátumnál a meglévő listát is egyedivé teszi és felépíti a 'seen' halmazt,
+    utána minden új válasz csak egy strip/lower + halmazvizsgálat.
+    """
+    seen = seen_keys.get(question)
+    if seen is None:
+        seen = seen_keys[question] = set()
+        existing, qa[question] = qa[question], []
+        _add_unique(qa[question], seen, existing)
+    _add_unique(qa[question], seen, answers)
+
+
+def _cached_load(path: Path, parser: Callable[[Path], Dict[str, List[str]]]) -> Dict[str, List[str]]:
+    """
+    A feldolgozott CSV-t a fájl melletti '<név>.cache.pkl' sidecarból tölti be,
+    ha az mtime/méret kulcs egyezik; különben lefuttatja a parsert és frissíti a cache-t.
+    Ha a sidecar nem írható (pl. csak olvasható fájlrendszer), csendben kihagyja.
+    """
+    stat = path.stat()
+    key = f"{_CACHE_FORMAT}-{stat.st_mtime_ns}-{stat.st_size}".encode("ascii")
+    sidecar = path.with_suffix(path.suffix + ".cache.pkl")
+    try:
+        with open(sidecar, "rb") as f:
+            if f.readline().rstrip(b"\n") == key:
+                return pickle.load(f)
+    except Exception:
+        # bármilyen olvasási/unpickle hiba (csonka fájl, eltűnt osztály, ...) cache-tévesztés:
+        # újra-parse, és a sidecar felülíródik
+        pass
+
+    result = parser(path)
+    # egyedi ideiglenes fájl: a Streamlit-sessionök egy folyamat szálai, a pid nem elég
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=sidecar.parent, prefix=f"{sidecar.name}.", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(key + b"\n")
+            f.write(pickle.dumps(result, protocol=5))
+        os.replace(tmp, sidecar)
+    except OSError:
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+    return result
 
 
 def beolvas_csv_dict(filename: str) -> Dict[str, List[str]]:
@@ -99,44 +257,43 @@ def beolvas_csv_dict(filename: str) -> Dict[str, List[str]]:
     - 'answer' oszlop: válaszok bontása ';' és ' - ' szeparátorok szerint,
       sor eleji '-' bulletok többsoros blokkot képeznek, a '/' nem bont.
     Visszaad: { kérdés: [válasz1, válasz2, ...] }
+    Az eredmény a CSV melletti sidecar fájlban gyorsítótárazódik (lásd _cached_load).
     """
     path = Path(filename)
     if not path.exists():
         raise FileNotFoundError(f"Nem található a fájl: {path.resolve()}")
+    return _cached_load(path, _parse_csv_dict)
 
-    dialect = _detect_csv_dialect(path)
-    with open(path, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f, dialect=dialect) if dialect else csv.DictReader(f)
-        rows = list(reader)
-
-    if not rows:
-        raise ValueError("A CSV üresnek tűnik.")
-
-    q_col = _find_column(rows[0], "question", "questions")
-    a_col = _find_column(rows[0], "answer", "answers")
-    if q_col is None or a_col is None:
-        raise KeyError("A CSV nem tartalmaz 'question' és 'answer' fejlécet.")
 
+def _parse_csv_dict(path: Path) -> Dict[str, List[str]]:
+    """A CSV tényleges feldolgozása (cache nélkül)."""
     qa: Dict[str, List[str]] = {}
-    for row in rows:
-        question = (row.get(q_col, "") or "").strip()
-        answer_raw = row.get(a_col, "") or ""
-        if not question:
-            continue
-        answers = _answers_from_cell(answer_raw)
-        # Duplikált kérdések esetén egyesítjük az egyedi válaszokat, az első előfordulás sorrendjét megtartva.
-        if question in qa:
-            merged = qa[question] + answers
-            seen = set()
-            uniq: List[str] = []
-            for ans in merged:
-                key = ans.strip().lower()
-                if key and key not in seen:
-                    seen.add(key)
-                    uniq.append(ans.strip())
-            qa[question] = uniq
-        else:
-            qa[question] = answers
+    seen_keys: Dict[str, Set[str]] = {}
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        dialect = _detect_csv_dialect(f)
+        reader = csv.reader(f, dialect=dialect) if dialect else csv.reader(f)
+        header = next(reader, None)
+        # az üres sorokat a DictReaderhez hasonlóan átugorjuk
+        first_row = next((r for r in reader if r), None)
+        if header is None or first_row is None:
+            raise ValueError("A CSV üresnek tűnik.")
+
+        q_idx = _find_column(header, "question", "questions")
+        a_idx = _find_column(header, "answer", "answers")
+        if q_idx is None or a_idx is None:
+            raise KeyError("A CSV nem tartalmaz 'question' és 'answer' fejlécet.")
+
+        for row in chain((first_row,), reader):
+            question = row[q_idx].strip() if q_idx < len(row) else ""
+            if not question:
+                continue
+            answer_raw = row[a_idx] if a_idx < len(row) else ""
+            answers = _answers_from_cell(answer_raw)
+            # Duplikált kérdések esetén egyesítjük az egyedi válaszokat, az első előfordulás sorrendjét megtartva.
+            if question in qa:
+                _merge_unique(qa, seen_keys, question, answers)
+            else:
+                qa[question] = answers
 
     if not qa:
         raise ValueError("Nem sikerült kérdés–válasz párokat beolvasni a CSV-ből.")
@@ -165,14 +322,18 @@ def valassz_kerdeseket(
     start_index: int = 0,
     randomize: bool = False,
     seed: int | None = None,
+    rng: random.Random | None = None,
 ) -> Tuple[List[str], int]:
-    """Kiválaszt n kérdést véletlenszerűen vagy a CSV-sorrend szerinti következő blokkból."""
+    """
+    Kiválaszt n kérdést véletlenszerűen vagy a CSV-sorrend szerinti következő blokkból.
+    Ha rng meg van adva, azt használja (a seed ilyenkor figyelmen kívül marad).
+    """
     if n > len(qa):
         raise ValueError("Nagyobb számot adtál meg, mint ahány kérdés rendelkezésre áll.")
 
-    questions = list(qa.keys())
+    questions = list(qa)
     if randomize:
-        rnd = random.Random(seed)
+        rnd = rng if rng is not None else random.Random(seed)
         return rnd.sample(questions, n), start_index % len(questions)
 
     return _circular_slice(questions, n, start_index=start_index)
@@ -187,20 +348,13 @@ def _osszefesul_qa(*qadictok: Dict[str, List[str]]) -> Dict[str, List[str]]:
     Azonos kérdésnél egyesíti az egyedi válaszokat (fehérszegély-érzékeny tisztítással).
     """
     vegyes: Dict[str, List[str]] = {}
+    seen_keys: Dict[str, Set[str]] = {}
     for qa in qadictok:
         for q, ans_list in qa.items():
             if q not in vegyes:
-                vegyes[q] = [a.strip() for a in ans_list if a and a.strip()]
+                vegyes[q] = [s for a in ans_list if a and (s := a.strip())]
             else:
-                merged = vegyes[q] + [a.strip() for a in ans_list if a and a.strip()]
-                seen = set()
-                uniq: List[str] = []
-                for a in merged:
-                    key = a.lower()
-                    if key and key not in seen:
-                        seen.add(key)
-                        uniq.append(a)
-                vegyes[q] = uniq
+                _merge_unique(vegyes, seen_keys, q, ans_list)
     return vegyes
 
 
@@ -240,18 +394,20 @@ def valassz_forras_es_kerdesek(
         raise ValueError("Az n legyen pozitív egész.")
 
     randomize = selection_mode == "random"
+    # egyetlen RNG a teljes kiválasztáshoz; a globális random állapotot nem érinti
+    rnd = random.Random(seed) if randomize else None
 
     if mod_norm == "1":
         qa = beolvas_csv_dict(fajl_1)
         kerd, next_1 = valassz_kerdeseket(
-            qa, n, start_index=start_index_1, randomize=randomize, seed=seed
+            qa, n, start_index=start_index_1, randomize=randomize, rng=rnd
         )
         return kerd, qa, {"start_index_1": next_1, "start_index_2": start_index_2}
 
     if mod_norm == "2":
         qa = beolvas_csv_dict(fajl_2)
         kerd, next_2 = valassz_kerdeseket(
-            qa, n, start_index=start_index_2, randomize=randomize, seed=seed
+            qa, n, start_index=start_index_2, randomize=randomize, rng=rnd
         )
         return kerd, qa, {"start_index_1": start_index_1, "start_index_2": next_2}
 
@@ -259,19 +415,21 @@ def valassz_forras_es_kerdesek(
     qa1 = beolvas_csv_dict(fajl_1)
     qa2 = beolvas_csv_dict(fajl_2)
 
+    # Rétegzett mintavétel rögzített allokációval (n1 = ⌈n/2⌉, n2 = n - n1); több forrásnál
+    # az arányos allokáció általános alakja n_h = n * N_h / N lenne. Rétegenként egy sample
+    # és a kiválasztott n elem egyetlen keverése O(n): a teljes kérdésbankot nem kell bejárni.
     n1 = math.ceil(n / 2)
     n2 = n - n1
 
     kerd1, next_1 = valassz_kerdeseket(
-        qa1, n1, start_index=start_index_1, randomize=randomize, seed=seed
+        qa1, n1, start_index=start_index_1, randomize=randomize, rng=rnd
     )
     kerd2, next_2 = valassz_kerdeseket(
-        qa2, n2, start_index=start_index_2, randomize=randomize, seed=None if seed is None else seed + 1
+        qa2, n2, start_index=start_index_2, randomize=randomize, rng=rnd
     )
 
     kivalasztott = kerd1 + kerd2
-    if randomize:
-        rnd = random.Random(None if seed is None else seed + 2)
+    if rnd is not None:
         rnd.shuffle(kivalasztott)
 
     qa_egyesitett = _osszefesul_qa(qa1, qa2)
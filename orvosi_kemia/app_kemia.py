@@ -1,12 +1,16 @@
 from __future__ import annotations
 import csv
+import io
 import json
+import os
+import pickle
 import random
 import re
+import tempfile
 import unicodedata
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple, TypeVar
 import streamlit as st
 
 
@@ -17,6 +21,12 @@ import streamlit as st
 APP_DIR = Path(__file__).parent
 KERDES_SZAM_KOR = 10
 KUSZOB = 7
+# Opcionális CSV-olvasó: QA_FAST_IO=polars esetén a polars-t próbálja először
+QA_FAST_IO = os.getenv("QA_FAST_IO", "").strip().lower()
+# A CSV melletti sidecar cache formátumverziója; a feldolgozás változásakor növelendő.
+CACHE_FORMAT = 3
+# Képbájt-cache mérete: a pic1 + pic2 képeinek száma (~155) felett, a régi verziók kiesnek
+IMG_CACHE_MAX = 256
 
 
 # =========================================================
@@ -45,6 +55,8 @@ def split_question_answer(q_text: str, a_text: str) -> Tuple[str, List[str]]:
 # 2) Sorszám kinyerése (1.1., 2.3., 1.100. → 1.01 / 2.03 / 1.100)
 # =========================================================
 
+_QNUM_RE = re.compile(r"^(\d+)\.(\d+)\.")
+
 
 def extract_qnum(kerdes: str) -> str | None:
     """
@@ -59,7 +71,7 @@ def extract_qnum(kerdes: str) -> str | None:
       1.01, 1.10, 1.100, 2.03, stb.
     """
     s = unicodedata.normalize("NFKC", kerdes or "").strip()
-    m = re.match(r"^(\d+)\.(\d+)\.", s)
+    m = _QNUM_RE.match(s)
     if not m:
         return None
 
@@ -77,38 +89,63 @@ def extract_qnum(kerdes: str) -> str | None:
 # =========================================================
 
 
+@st.cache_data(show_spinner=False)
+def _list_pic_dir(pic_dir: Path, mtime_ns: int) -> List[str]:
+    """
+    A képmappa PNG fájlneveinek egyszeri listázása.
+    Az mtime_ns csak cache-kulcs: új/törölt kép esetén a lista frissül.
+    """
+    return sorted(p.name for p in pic_dir.iterdir() if p.name.endswith((".png", ".PNG")))
+
+
 def find_images(qnum: str, pic_dir: Path) -> List[Path]:
     """
     Szigorú képszabály:
       • fő kép:       qnum.png / qnum.PNG
       • extra képek:  qnum_*.png / qnum_*.PNG
     JPG/JPEG nem engedélyezett → nem lesz duplikáció.
+    A mappát nem globoljuk minden rendereléskor: a (cache-elt) névlistán szűrünk.
     """
-    images: List[Path] = []
+    if not pic_dir.is_dir():
+        return []
+    names = _list_pic_dir(pic_dir, pic_dir.stat().st_mtime_ns)
+    name_set = set(names)
 
     # Fő kép
-    for ext in (".png", ".PNG"):
-        p = pic_dir / f"{qnum}{ext}"
-        if p.exists():
-            images.append(p)
-            break  # csak egy fő kép legyen
+    mains = [n for n in (f"{qnum}.png", f"{qnum}.PNG") if n in name_set][:1]
 
     # Extra képek (_ után)
-    extras = []
+    prefix = f"{qnum}_"
+    extras: List[str] = []
     for ext in (".png", ".PNG"):
         extras.extend(
-            sorted(pic_dir.glob(f"{qnum}_*{ext}"), key=lambda p: p.name.lower())
+            sorted(
+                (n for n in names if n.startswith(prefix) and n.endswith(ext)),
+                key=str.lower,
+            )
         )
 
-    # Dedup
-    out, seen = [], set()
-    for p in images + extras:
-        rp = p.resolve()
-        if rp not in seen:
-            seen.add(rp)
-            out.append(p)
+    # egyetlen listázásból származó nevek → nincs szükség resolve()-os dedupra
+    return [pic_dir / n for n in mains + extras]
+
+
+@st.cache_data(show_spinner=False)
+def _imgs_for(qnum: str, pic_dir: str, dir_mtime_ns: int) -> Tuple[str, ...]:
+    """
+    Egy kérdés képei feloldott útvonallal, duplikátumok nélkül – a cache építésekor egyszer.
+    A dir_mtime_ns csak cache-kulcs, hogy a mappa változása látszódjon.
+    """
+    # dict.fromkeys: sorrendtartó dedup
+    return tuple(dict.fromkeys(str(p.resolve()) for p in find_images(qnum, Path(pic_dir))))
+
 
-    return out
+@st.cache_resource(show_spinner=False, max_entries=IMG_CACHE_MAX)
+def _img_bytes(path: str, mtime_ns: int) -> bytes:
+    """
+    Kép bájtjai memóriában (cache_resource: nincs példánymásolás hívásonként).
+    Az mtime_ns miatt a helyben módosított fájl újraolvasódik.
+    """
+    return Path(path).read_bytes()
 
 
 # =========================================================
@@ -116,25 +153,123 @@ def find_images(qnum: str, pic_dir: Path) -> List[Path]:
 # =========================================================
 
 
-def read_csv_intelligent(path: Path) -> Dict[str, List[str]]:
-    qa: Dict[str, List[str]] = {}
-    with path.open("r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        if not reader.fieldnames:
-            return {}
+# A kérdésbank párhuzamos listákban: (kérdések, sorszámok, válaszok), az i. kérdés adatai azonos
+# indexen. Szándékosan csak beépített típusok: a st.cache_data és a sidecar picklézi az értéket,
+# a scriptben definiált osztály (__main__.X) pedig callbackből / új folyamatból nem töltődne vissza.
+QA = Tuple[List[str], List[Optional[str]], List[List[str]]]
+
+
+def _rows_arrow(path: Path, n_cols: int, i_q: int, i_a: int) -> Optional[Iterable[Tuple[str, str]]]:
+    """
+    (kérdés, válasz) párok pyarrow natív CSV-olvasójával; minden oszlop string marad.
+    Ha bármely sor oszlopszáma eltér a fejléctől (vagy más parse-hiba van), None-t ad,
+    és a csv modul dolgozza fel a fájlt – így a kimenet mindig egyezik vele.
+    A pyarrow csak itt, parse-kor töltődik be (az app indulását nem lassítja); hiánya esetén None.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pac
+    except ImportError:
+        return None
+    names = [f"c{i}" for i in range(n_cols)]
+    try:
+        table = pac.read_csv(
+            path,
+            read_options=pac.ReadOptions(use_threads=True, skip_rows=1, column_names=names),
+            parse_options=pac.ParseOptions(newlines_in_values=True),
+            convert_options=pac.ConvertOptions(
+                column_types={n: pa.string() for n in names},
+                include_columns=[names[i_q], names[i_a]],
+            ),
+        )
+    except pa.ArrowInvalid:
+        return None
+    return zip(table.column(0).to_pylist(), table.column(1).to_pylist())
+
 
-        fn = {c.lower().strip(): c for c in reader.fieldnames}
-        c_q = fn.get("question")
-        c_a = fn.get("answer")
+def _rows_polars(path: Path, n_cols: int, i_q: int, i_a: int) -> Optional[Iterable[Tuple[str, str]]]:
+    """
+    (kérdés, válasz) párok a polars többszálú CSV-olvasójával (QA_FAST_IO=polars).
+    Minden oszlop string; rövid sor hiányzó cellája None → üres, hosszú sor többlete levágva,
+    ahogy a csv modulnál is. Hibás idézőjelezésnél és magányos '\r' sorvégnél eltérhet
+    a csv modultól, ezért csak kérésre fut. Hiányzó polars vagy parse-hiba esetén None.
+    """
+    try:
+        import polars as pl
+    except ImportError:
+        return None
+    try:
+        df = pl.read_csv(
+            path,
+            has_header=False,
+            skip_rows=1,
+            schema={f"c{i}": pl.String for i in range(n_cols)},
+            columns=[i_q, i_a],
+            truncate_ragged_lines=True,
+            encoding="utf8",
+            raise_if_empty=False,
+        )
+    except (pl.exceptions.PolarsError, OSError):
+        return None
+    return ((q or "", a or "") for q, a in df.iter_rows())
+
+
+def _rows_csv(path: Path, i_q: int, i_a: int) -> Iterator[Tuple[str, str]]:
+    """
+    (kérdés, válasz) párok a csv modullal; rövid sorban a hiányzó cella üres.
+    A fájl egyben olvasódik és dekódolódik; a StringIO(newline="") ugyanúgy tagol,
+    mint a newline=""-nel nyitott fájl (a splitlines() más sorvégeken is vágna).
+    """
+    text = path.read_bytes().decode("utf-8-sig")
+    reader = csv.reader(io.StringIO(text, newline=""))
+    next(reader, None)
+    for row in reader:
+        q_text = row[i_q] if i_q < len(row) else ""
+        a_text = row[i_a] if 0 <= i_a < len(row) else ""
+        yield q_text, a_text
 
-        for row in reader:
-            q_text = (row.get(c_q) or "").strip()
-            a_text = (row.get(c_a) or "").strip()
-            q, answers = split_question_answer(q_text, a_text)
-            if q:
-                qa[q] = answers
 
-    return qa
+def read_csv_intelligent(path: Path) -> QA:
+    with path.open("r", encoding="utf-8-sig", newline="") as f:
+        header = next(csv.reader(f), None)
+    if not header:
+        return [], [], []
+
+    # oszlopindexek egyszer; ismétlődő fejlécnél az utolsó nyer (mint a DictReadernél)
+    fn = {c.lower().strip(): i for i, c in enumerate(header)}
+    i_q = fn.get("question", -1)
+    i_a = fn.get("answer", -1)
+    if i_q < 0:
+        return [], [], []
+
+    rows = None
+    if QA_FAST_IO == "polars" and i_a >= 0:
+        rows = _rows_polars(path, len(header), i_q, i_a)
+    if rows is None and i_a >= 0:
+        rows = _rows_arrow(path, len(header), i_q, i_a)
+    if rows is None:
+        rows = _rows_csv(path, i_q, i_a)
+
+    # ismétlődő kérdésnél az első pozíció marad, a válasz az utolsó (mint a dictnél);
+    # a sorszám kérdésenként egyszer, betöltéskor kerül kinyerésre
+    questions: List[str] = []
+    qnums: List[Optional[str]] = []
+    answers_l: List[List[str]] = []
+    idx: Dict[str, int] = {}
+    for q_text, a_text in rows:
+        q, answers = split_question_answer(q_text.strip(), a_text.strip())
+        if not q:
+            continue
+        i = idx.get(q)
+        if i is not None:
+            answers_l[i] = answers
+            continue
+        idx[q] = len(questions)
+        questions.append(q)
+        qnums.append(extract_qnum(q))
+        answers_l.append(answers)
+
+    return questions, qnums, answers_l
 
 
 # =========================================================
@@ -142,12 +277,9 @@ def read_csv_intelligent(path: Path) -> Dict[str, List[str]]:
 # =========================================================
 
 
-def valassz_kerdese(qa: Dict[str, List[str]], db: int) -> List[str]:
-    keys = list(qa.keys())
-    if len(keys) <= db:
-        random.shuffle(keys)
-        return keys
-    return random.sample(keys, db)
+def valassz_kerdese(n: int, db: int) -> List[int]:
+    """db (vagy ha kevesebb van, mind az n) kérdésindex véletlen sorrendben; lista nem készül."""
+    return random.sample(range(n), min(db, n))
 
 
 # =========================================================
@@ -155,9 +287,54 @@ def valassz_kerdese(qa: Dict[str, List[str]], db: int) -> List[str]:
 # =========================================================
 
 
-@st.cache_data(show_spinner=False)
-def betolt_qa_cached(path: Path) -> Dict[str, List[str]]:
-    return read_csv_intelligent(path)
+T = TypeVar("T")
+
+
+def _cached_load(path: Path, parser: Callable[[Path], T]) -> T:
+    """
+    Lemezes cache: a feldolgozott CSV a '<név>.cache.pkl' sidecarba kerül,
+    kulcsa az mtime + méret. Új szerverfolyamat így nem parse-olja újra a CSV-t.
+    """
+    stat = path.stat()
+    key = f"{CACHE_FORMAT}-{stat.st_mtime_ns}-{stat.st_size}".encode("ascii")
+    sidecar = path.with_suffix(path.suffix + ".cache.pkl")
+    try:
+        with open(sidecar, "rb") as f:
+            if f.readline().rstrip(b"\n") == key:
+                return pickle.load(f)
+    except Exception:
+        # bármilyen olvasási/unpickle hiba (csonka fájl, eltűnt osztály, ...) cache-tévesztés:
+        # újra-parse, és a sidecar felülíródik
+        pass
+
+    result = parser(path)
+    # egyedi ideiglenes fájl: a Streamlit-sessionök egy folyamat szálai, a pid nem elég
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=sidecar.parent, prefix=f"{sidecar.name}.", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(key + b"\n")
+            f.write(pickle.dumps(result, protocol=5))
+        os.replace(tmp, sidecar)
+    except OSError:
+        # csak olvasható telepítésnél egyszerűen cache nélkül megyünk tovább
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+    return result
+
+
+def _path_hash(p: Path) -> Tuple[str, int]:
+    """Cache-kulcs CSV-útvonalhoz: útvonal + mtime, így csak valódi fájlváltozás érvényteleníti."""
+    return str(p), p.stat().st_mtime_ns
+
+
+@st.cache_data(max_entries=4, show_spinner=False, hash_funcs={Path: _path_hash})
+def betolt_qa_cached(path: Path) -> QA:
+    # memóriabeli cache; hidegindításkor a CACHE_FORMAT-tal verziózott sidecar olvasódik be
+    return _cached_load(path, read_csv_intelligent)
 
 
 # =========================================================
@@ -165,6 +342,57 @@ def betolt_qa_cached(path: Path) -> Dict[str, List[str]]:
 # =========================================================
 
 
+@st.fragment
+def _render_question(i: int, k: int, qa: QA, pic_dir: Path, pic_mtime_ns: int):
+    """
+    Egy kérdés blokkja külön fragmentként: a gomb/rádió csak ezt a blokkot futtatja újra,
+    nem a teljes appot. i a kör-beli pozíció (0-tól; a show_answer / itel listák indexe),
+    k a kérdés indexe a QA listáiban.
+    """
+    ss = st.session_state
+    questions, qnums, answers = qa
+    st.markdown(f"**{i + 1}.** {questions[k]}")
+    cA, cB = st.columns([1, 2])
+
+    with cA:
+        st.button(
+            "👀 Válasz megjelenítése",
+            key=f"show_{i + 1}",
+            use_container_width=True,
+            on_click=_show,
+            args=(i,),
+        )
+
+    with cB:
+        if ss.show_answer[i]:
+
+            # válaszok lista egyetlen markdown blokkban
+            st.markdown("\n".join(f"- {a}" for a in answers[k]))
+
+            # képek → nagy, eredeti szerű megjelenítés (NINCS caption); a sorszám betöltéskor kinyerve
+            qnum = qnums[k]
+            if qnum:
+                for img in _imgs_for(qnum, str(pic_dir), pic_mtime_ns):
+                    # ÚJ: nincs caption, nincs kicsinyítés
+                    st.image(_img_bytes(img, os.stat(img).st_mtime_ns), use_container_width=True)
+
+            # önértékelés (az alapértelmezett "helyes"-t a _show, a változást a _toggle könyveli)
+            st.radio(
+                "Önértékelés:",
+                ["Helyesnek ítélem", "Nem volt helyes"],
+                index=1 if ss.itel[i] == "hibas" else 0,
+                key=f"eval_{i + 1}",
+                horizontal=True,
+                on_change=_toggle,
+                args=(i,),
+            )
+
+        else:
+            st.info("Kattints a válasz megjelenítésére.")
+
+    st.write("---")
+
+
 def run_app():
     st.set_page_config(page_title="Orvosi kémia kvíz", page_icon="🧪", layout="wide")
 
@@ -183,13 +411,18 @@ def run_app():
         PIC_DIR = APP_DIR / "pic2"
 
     qa = betolt_qa_cached(CSV_PATH)
+    forras = _path_hash(CSV_PATH)
+    pic_mtime_ns = PIC_DIR.stat().st_mtime_ns if PIC_DIR.is_dir() else 0
 
     # Session state
     ss = st.session_state
     ss.setdefault("kor_kerdesei", [])
-    ss.setdefault("show_answer", {})
-    ss.setdefault("itel", {})
+    ss.setdefault("show_answer", [])
+    ss.setdefault("itel", [])
     ss.setdefault("osszegzes", None)
+    ss.setdefault("kor_forras", None)
+    ss.setdefault("helyes_db", 0)
+    ss.setdefault("itelt_db", 0)
 
     # Gombok
     col1, col2 = st.columns(2)
@@ -198,79 +431,52 @@ def run_app():
             f"🧪 Új kör indítása ({KERDES_SZAM_KOR} kérdés)",
             type="primary",
             use_container_width=True,
-            on_click=lambda: start_new_round(qa),
+            on_click=start_new_round,
+            args=(len(qa[0]), forras),
         )
     with col2:
         st.button("♻️ Teljes reset", use_container_width=True, on_click=reset_all)
 
     st.divider()
 
+    # a kör indexei a saját CSV-jére mutatnak: félévváltás vagy CSV-módosítás után nem érvényesek
+    if ss.kor_kerdesei and ss.kor_forras != forras:
+        reset_all()
+
     if not ss.kor_kerdesei:
         st.info("Kezdéshez indíts új kört.")
         return
 
-    # Állapot
-    helyes_db = sum(1 for k in ss.kor_kerdesei if ss.itel.get(k) == "helyes")
-    itelt_db = sum(1 for k in ss.kor_kerdesei if ss.itel.get(k) in ("helyes", "hibas"))
-
-    st.caption(f"Önértékelt: {itelt_db}/{len(ss.kor_kerdesei)} — Helyes: {helyes_db}")
+    # Állapot (a számlálókat _set_itel tartja naprakészen)
+    st.caption(f"Önértékelt: {ss.itelt_db}/{len(ss.kor_kerdesei)} — Helyes: {ss.helyes_db}")
 
     # Kérdések
-    for i, kerdes in enumerate(ss.kor_kerdesei, start=1):
-        st.markdown(f"**{i}.** {kerdes}")
-        cA, cB = st.columns([1, 2])
-
-        with cA:
-            st.button(
-                "👀 Válasz megjelenítése",
-                key=f"show_{i}",
-                use_container_width=True,
-                on_click=lambda k=kerdes: ss.show_answer.__setitem__(k, True),
-            )
-
-        with cB:
-            if ss.show_answer.get(kerdes):
-
-                # válaszok lista
-                answers = qa.get(kerdes, [""])
-                for a in answers:
-                    st.markdown(f"- {a}")
-
-                # képek → nagy, eredeti szerű megjelenítés (NINCS caption)
-                qnum = extract_qnum(kerdes)
-                if qnum:
-                    imgs = find_images(qnum, PIC_DIR)
-                    shown = set()
-                    for img in imgs:
-                        rp = img.resolve()
-                        if rp in shown:
-                            continue
-                        shown.add(rp)
-
-                        # ÚJ: nincs caption, nincs kicsinyítés
-                        st.image(str(img), use_container_width=True)
-
-                # önértékelés
-                cur = ss.itel.get(kerdes)
-                idx = 0 if cur in (None, "helyes") else 1
-                val = st.radio(
-                    "Önértékelés:",
-                    ["Helyesnek ítélem", "Nem volt helyes"],
-                    index=idx,
-                    key=f"eval_{i}",
-                    horizontal=True,
-                )
-                ss.itel[kerdes] = "helyes" if val == "Helyesnek ítélem" else "hibas"
-
-            else:
-                st.info("Kattints a válasz megjelenítésére.")
-
-        st.write("---")
+    for i, k in enumerate(ss.kor_kerdesei):
+        _render_question(i, k, qa, PIC_DIR, pic_mtime_ns)
 
     # Kiértékelés
+    # az export JSON egyszer, a kiértékeléskor készül – nem minden rerunnál
     if st.button("🏁 Teszt kiértékelése", type="primary"):
-        helyes_db = sum(1 for k in ss.kor_kerdesei if ss.itel.get(k) == "helyes")
-        ss.osszegzes = {"helyes_db": helyes_db, "sikeres": helyes_db >= KUSZOB}
+        h = ss.helyes_db
+        questions, _, answers = qa
+        kor_id = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        export = {
+            "kor_id": kor_id,
+            "kerdesek_szama": len(ss.kor_kerdesei),
+            "kuszob": KUSZOB,
+            "helyes_db": h,
+            "sikeres": h >= KUSZOB,
+            "reszletek": [
+                {"kerdes": questions[k], "valaszok": answers[k], "itel": v}
+                for k, v in zip(ss.kor_kerdesei, ss.itel)
+            ],
+        }
+        ss.osszegzes = {
+            "kor_id": kor_id,
+            "helyes_db": h,
+            "sikeres": h >= KUSZOB,
+            "export": json.dumps(export, ensure_ascii=False, indent=2).encode("utf-8"),
+        }
 
     if ss.osszegzes:
         h = ss.osszegzes["helyes_db"]
@@ -281,21 +487,9 @@ def run_app():
         else:
             st.error(f"❌ Sikertelen — {h}/{len(ss.kor_kerdesei)}")
 
-        export = {
-            "kor_id": datetime.utcnow().isoformat() + "Z",
-            "kerdesek_szama": len(ss.kor_kerdesei),
-            "kuszob": KUSZOB,
-            "helyes_db": h,
-            "sikeres": s,
-            "reszletek": [
-                {"kerdes": k, "valaszok": qa.get(k, [""]), "itel": ss.itel.get(k)}
-                for k in ss.kor_kerdesei
-            ],
-        }
-
         st.download_button(
             "📥 JSON export",
-            data=json.dumps(export, ensure_ascii=False, indent=2).encode("utf-8"),
+            data=ss.osszegzes["export"],
             file_name="kviz_eredmeny.json",
             mime="application/json",
         )
@@ -306,20 +500,60 @@ def run_app():
 # =========================================================
 
 
-def start_new_round(qa: Dict[str, List[str]]):
+def start_new_round(n: int, forras: Tuple[str, int]):
+    """
+    Új kör n kérdésből. Callbackként fut, a script törzse előtt – ezért nem hív cache-elt
+    betöltést; a bank méretét és a forrás (útvonal, mtime) kulcsát a gomb adja át.
+    """
     ss = st.session_state
-    ss.kor_kerdesei = valassz_kerdese(qa, KERDES_SZAM_KOR)
-    ss.show_answer = {k: False for k in ss.kor_kerdesei}
-    ss.itel = {k: None for k in ss.kor_kerdesei}
+    # a kör kérdései indexek a QA listáiba (nem a hosszú kérdésszövegek)
+    ss.kor_kerdesei = valassz_kerdese(n, KERDES_SZAM_KOR)
+    ss.kor_forras = forras
+    # kör-beli pozícióval indexelt, előre lefoglalt listák
+    ss.show_answer = [False] * len(ss.kor_kerdesei)
+    ss.itel = [None] * len(ss.kor_kerdesei)
     ss.osszegzes = None
+    ss.helyes_db = 0
+    ss.itelt_db = 0
 
 
 def reset_all():
     ss = st.session_state
     ss.kor_kerdesei = []
-    ss.show_answer = {}
-    ss.itel = {}
+    ss.kor_forras = None
+    ss.show_answer = []
+    ss.itel = []
     ss.osszegzes = None
+    ss.helyes_db = 0
+    ss.itelt_db = 0
+
+
+def _show(i: int):
+    """
+    A 'Válasz megjelenítése' gomb callbackje.
+    A rádió alapértéke ("helyes") itt, renderelés előtt kerül a számlálókba.
+    """
+    ss = st.session_state
+    ss.show_answer[i] = True
+    if ss.itel[i] is None:
+        _set_itel(i, "helyes")
+
+
+def _set_itel(i: int, uj: Optional[str]):
+    """Az i. kérdés ítéletének beállítása; a helyes/itélt számlálókat a különbséggel frissíti."""
+    ss = st.session_state
+    regi = ss.itel[i]
+    if regi == uj:
+        return
+    ss.itel[i] = uj
+    ss.itelt_db += (uj is not None) - (regi is not None)
+    ss.helyes_db += (uj == "helyes") - (regi == "helyes")
+
+
+def _toggle(i: int):
+    """Az önértékelő rádió on_change callbackje: az új értéket könyveli."""
+    val = st.session_state[f"eval_{i + 1}"]
+    _set_itel(i, "helyes" if val == "Helyesnek ítélem" else "hibas")
 
 
 # =========================================================